@@ -14,14 +14,19 @@ Usage:
 import json
 import sys
 import os
+import multiprocessing
 from pathlib import Path
-from tabulate import tabulate
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the standard json module
+    orjson = None
+    _loads = json.loads
 
 # Add current directory to path
 sys.path.append(str(Path(__file__).parent))
 
-from test_yolov8 import YOLOv8Scheduler
-
 
 def find_json_files(directory):
     """Find all JSON files in directory"""
@@ -41,36 +46,52 @@ def find_json_files(directory):
 def load_workload(filepath):
     """Load workload from JSON file"""
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            return _loads(f.read())
     except Exception as e:
         print(f"⚠️  Warning: Could not load {filepath}: {str(e)}")
         return None
 
 
-def schedule_workload(workload, bandwidth, latency):
-    """Schedule a workload with given parameters"""
+def save_results(all_results, output_file):
+    """Save detailed results to JSON file"""
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(all_results, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(all_results, f, indent=2)
+
+
+def schedule_workload(workload, bandwidth, latency, processors):
+    """Schedule a workload with given parameters, returning (results, error)"""
+    # Imported here so directory/file checks don't pay for the scheduler import
+    from test_yolov8 import YOLOv8Scheduler
+    
     try:
-        # Get processor types
-        processor_types = list(workload['nodes'][0]['costs'].keys())
-        
         config = {
             "workload": {
                 "nodes": workload['nodes'],
                 "edges": workload.get('edges', [])
             },
             "system_config": {
-                "processors": {proc: {"performance_GFLOPS": 1.0} for proc in processor_types},
+                "processors": processors,
                 "bandwidth_MBps": bandwidth,
                 "latency_ms": latency
             }
         }
         
-        scheduler = YOLOv8Scheduler(json.dumps(config))
-        return scheduler.optimize()
+        scheduler = YOLOv8Scheduler.from_dict(config)
+        return scheduler.optimize(), None
     except Exception as e:
-        print(f"⚠️  Warning: Scheduling failed: {str(e)}")
-        return None
+        return None, str(e)
+
+
+def _run_one(task):
+    """Pool worker: schedule one workload under every (name, bandwidth, latency) config"""
+    workload, processors, configs = task
+    return [schedule_workload(workload, bandwidth, latency, processors)
+            for _, bandwidth, latency in configs]
 
 
 def main():
@@ -89,6 +110,13 @@ def main():
     json_files = find_json_files(directory)
     print(f"Found {len(json_files)} workload file(s)\n")
     
+    try:
+        from tabulate import tabulate
+    except ImportError:
+        print("❌ Error: 'tabulate' package required")
+        print("   Install with: pip install tabulate")
+        sys.exit(1)
+    
     # Test configurations
     configs = [
         ("High-Speed", 2000, 1),
@@ -96,15 +124,32 @@ def main():
         ("Low-Speed", 500, 5)
     ]
     
-    # Store results
-    all_results = []
-    
-    # Process each workload
+    # Load workloads and queue one scheduling task per workload
+    workloads = []
+    tasks = []
     for json_file in sorted(json_files):
         workload = load_workload(json_file)
         if workload is None:
             continue
         
+        # Processor config is shared by every configuration
+        node_costs = workload.get('nodes', [])
+        processor_types = list(node_costs[0]['costs'].keys()) if node_costs else []
+        processors = {proc: {"performance_GFLOPS": 1.0} for proc in processor_types}
+        
+        workloads.append((json_file, workload, processor_types))
+        tasks.append((workload, processors, configs))
+    
+    # Schedule everything in parallel; printing below stays serial so output isn't interleaved
+    processes = max(1, min(os.cpu_count() or 1, len(tasks)))
+    with multiprocessing.Pool(processes=processes) as pool:
+        scheduled = pool.map(_run_one, tasks)
+    
+    # Store results
+    all_results = []
+    
+    # Process each workload
+    for (json_file, workload, processor_types), outcomes in zip(workloads, scheduled):
         workload_id = workload.get('workload_id', json_file.stem)
         num_tasks = len(workload.get('nodes', []))
         num_edges = len(workload.get('edges', []))
@@ -120,23 +165,26 @@ def main():
             proc_types = ', '.join(workload['nodes'][0]['costs'].keys())
             print(f"  Processors: {proc_types}")
         
+        # Best single processor time is the same for every configuration
+        single_proc_times = dict.fromkeys(processor_types, 0)
+        for node in workload.get('nodes', []):
+            costs = node['costs']
+            for proc in processor_types:
+                single_proc_times[proc] += costs.get(proc, float('inf'))
+        best_single = min(single_proc_times.values(), default=float('inf'))
+        
         # Test with different configurations
         workload_results = []
         
-        for config_name, bandwidth, latency in configs:
-            results = schedule_workload(workload, bandwidth, latency)
+        for (config_name, bandwidth, latency), (results, error) in zip(configs, outcomes):
+            if error is not None:
+                print(f"⚠️  Warning: Scheduling failed: {error}")
             
             if results:
                 makespan = results['makespan_ms']
                 fps = 1000 / makespan
                 
                 # Calculate speedup vs best single processor
-                processor_types = list(workload['nodes'][0]['costs'].keys())
-                single_proc_times = {
-                    proc: sum(node['costs'].get(proc, float('inf')) for node in workload['nodes'])
-                    for proc in processor_types
-                }
-                best_single = min(single_proc_times.values())
                 speedup = best_single / makespan
                 
                 workload_results.append([
@@ -192,8 +240,7 @@ def main():
         
         # Save detailed results
         output_file = 'batch_test_results.json'
-        with open(output_file, 'w') as f:
-            json.dump(all_results, f, indent=2)
+        save_results(all_results, output_file)
         
         print(f"\n✓ Detailed results saved to: {output_file}")
     
@@ -201,11 +248,4 @@ def main():
 
 
 if __name__ == "__main__":
-    try:
-        from tabulate import tabulate
-    except ImportError:
-        print("❌ Error: 'tabulate' package required")
-        print("   Install with: pip install tabulate")
-        sys.exit(1)
-    
     main()
@@ -1,173 +1,435 @@
 import json
-from collections import defaultdict, deque
+from collections import namedtuple
+
+import numpy as np
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the standard json module
+    _loads = json.loads
+
+# numba costs far more to import and compile than the plain-Python kernels take
+# on small graphs, so it is only loaded (on first use) for graphs this large
+_JIT_MIN_NODES = 10000
+
+prange = range  # replaced by numba.prange once numba is loaded
+
+
+def _kahn_order(succ_ptr, succ_idx, in_degree):
+    """Kahn's algorithm over CSR successor lists, returns node indices in order"""
+    num_nodes = in_degree.shape[0]
+    in_degree = in_degree.copy()
+    queue = np.empty(num_nodes, np.int32)
+    head = 0
+    tail = 0
+    
+    # Find all entry nodes (no predecessors)
+    for i in range(num_nodes):
+        if in_degree[i] == 0:
+            queue[tail] = i
+            tail += 1
+    
+    while head < tail:
+        i = queue[head]
+        head += 1
+        for k in range(succ_ptr[i], succ_ptr[i + 1]):
+            succ = succ_idx[k]
+            in_degree[succ] -= 1
+            if in_degree[succ] == 0:
+                queue[tail] = succ
+                tail += 1
+    
+    return queue[:tail]
+
+
+def _sink_levels(topo_order, succ_ptr, succ_idx):
+    """Longest distance (in edges) from each node to an exit node"""
+    level = np.zeros(topo_order.shape[0], np.int64)
+    for k in range(topo_order.shape[0] - 1, -1, -1):
+        i = topo_order[k]
+        for e in range(succ_ptr[i], succ_ptr[i + 1]):
+            if level[succ_idx[e]] + 1 > level[i]:
+                level[i] = level[succ_idx[e]] + 1
+    return level
+
+
+def _upward_ranks(avg_comp_cost, succ_ptr, succ_idx, succ_cost, level_ptr, level_order):
+    """Upward ranks, one level at a time starting from the exit nodes
+    
+    Successors always sit on a lower level, so the nodes of a level only read
+    finished ranks and can be processed in parallel.
+    """
+    rank = np.zeros(avg_comp_cost.shape[0])
+    for lvl in range(level_ptr.shape[0] - 1):
+        for k in prange(level_ptr[lvl], level_ptr[lvl + 1]):
+            i = level_order[k]
+            max_succ_rank = 0.0
+            for e in range(succ_ptr[i], succ_ptr[i + 1]):
+                if succ_cost[e] + rank[succ_idx[e]] > max_succ_rank:
+                    max_succ_rank = succ_cost[e] + rank[succ_idx[e]]
+            
+            # Exit nodes only carry their own average computation cost
+            rank[i] = avg_comp_cost[i] + max_succ_rank
+    return rank
+
+
+def _heft_schedule(comp_cost, pred_ptr, pred_idx, edge_cost_ms, sorted_tasks):
+    """HEFT processor selection over flat arrays (CSR predecessor lists)"""
+    num_nodes, num_procs = comp_cost.shape
+    proc_ready = np.zeros(num_procs)
+    data_ready = np.zeros(num_procs)
+    assigned_proc = np.full(num_nodes, -1, np.int64)
+    start_t = np.zeros(num_nodes)
+    end_t = np.zeros(num_nodes)
+    
+    for t in sorted_tasks:
+        # When all data dependencies are satisfied, per processor
+        data_ready[:] = 0.0
+        for e in range(pred_ptr[t], pred_ptr[t + 1]):
+            pred = pred_idx[e]
+            for p in range(num_procs):
+                comm_cost = 0.0 if assigned_proc[pred] == p else edge_cost_ms[e]
+                if end_t[pred] + comm_cost > data_ready[p]:
+                    data_ready[p] = end_t[pred] + comm_cost
+        
+        # Select processor with minimum EFT (first one wins ties)
+        best_proc = -1
+        best_est = 0.0
+        best_eft = np.inf
+        for p in range(num_procs):
+            est = max(proc_ready[p], data_ready[p])
+            eft = est + comp_cost[t, p]
+            if eft < best_eft:
+                best_proc = p
+                best_est = est
+                best_eft = eft
+        
+        assigned_proc[t] = best_proc
+        start_t[t] = best_est
+        end_t[t] = best_eft
+        proc_ready[best_proc] = best_eft
+    
+    return assigned_proc, start_t, end_t
+
+
+_Kernels = namedtuple('_Kernels', 'kahn_order sink_levels upward_ranks heft_schedule')
+
+_PY_KERNELS = _Kernels(_kahn_order, _sink_levels, _upward_ranks, _heft_schedule)
+_jit_kernels = None
+
+
+def _kernels(num_nodes):
+    """Kernels for a graph of num_nodes nodes, JIT-compiled with numba for large graphs"""
+    global _jit_kernels, prange
+    if num_nodes < _JIT_MIN_NODES:
+        return _PY_KERNELS
+    
+    if _jit_kernels is None:
+        try:
+            import numba
+        except ImportError:  # numba is optional; run the kernels as plain Python
+            _jit_kernels = _PY_KERNELS
+        else:
+            prange = numba.prange
+            _jit_kernels = _Kernels(
+                numba.njit(cache=True)(_kahn_order),
+                numba.njit(cache=True)(_sink_levels),
+                numba.njit(parallel=True, cache=True)(_upward_ranks),
+                numba.njit(cache=True)(_heft_schedule))
+    return _jit_kernels
+
 
 class CADOScheduler:
-    def __init__(self, config_json):
-        self.data = json.loads(config_json)
+    def __init__(self, config):
+        # Accept either JSON text (str or bytes) or an already parsed config dict
+        if isinstance(config, (str, bytes, bytearray)):
+            config = _loads(config)
+        self._load(config)
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create a scheduler from an already parsed config dict (no JSON round-trip)"""
+        self = cls.__new__(cls)
+        self._load(data)
+        return self
+    
+    @classmethod
+    def from_precomputed(cls, data, rank):
+        """Create a scheduler that reuses upward ranks computed for the same DAG and system"""
+        self = cls.from_dict(data)
+        rank = np.asarray(rank, dtype=float)
+        
+        # One rank per node: the scheduling kernel indexes by these without bounds checks
+        if rank.shape != (len(self.node_ids),):
+            raise ValueError(f"rank has shape {rank.shape}, expected ({len(self.node_ids)},)")
+        self._rank = rank
+        return self
+    
+    @classmethod
+    def from_arrays(cls, node_ids, procs, comp_cost, src, dst, data_mb, bandwidth_MBps, latency_ms):
+        """Create a scheduler straight from array data
+        
+        comp_cost is the (nodes x processors) cost table in ms; edges are given as
+        parallel arrays of source/destination node indices and data sizes in MB.
+        The dict views (data, nodes, edges, system) are None for such schedulers.
+        """
+        comp_cost = np.asarray(comp_cost, dtype=float)
+        src, dst, data_mb = np.asarray(src), np.asarray(dst), np.asarray(data_mb, dtype=float)
+        
+        # The kernels index by these without bounds checks, so reject inconsistent input here
+        num_nodes = len(node_ids)
+        if comp_cost.shape != (num_nodes, len(procs)):
+            raise ValueError(f"comp_cost has shape {comp_cost.shape}, "
+                             f"expected ({num_nodes}, {len(procs)})")
+        if not (src.ndim == 1 and src.shape == dst.shape == data_mb.shape):
+            raise ValueError("src, dst and data_mb must be 1-D arrays of the same length")
+        for name, idx in (('src', src), ('dst', dst)):
+            if idx.size and (idx.min() < 0 or idx.max() >= num_nodes):
+                raise ValueError(f"{name} holds node indices outside [0, {num_nodes})")
+        
+        self = cls.__new__(cls)
+        self.data = self.nodes = self.edges = self.system = None
+        self._procs_cfg = None
+        self._init_graph(node_ids, procs, src, dst, data_mb, bandwidth_MBps, latency_ms)
+        
+        self.comp_cost = comp_cost
+        self.avg_comp_cost = self.comp_cost.mean(axis=1)
+        return self
+    
+    def _load(self, data):
+        """Populate scheduler state from a parsed config dict"""
+        self.data = data
         self.nodes = {n['id']: n for n in self.data['workload']['nodes']}
         self.edges = self.data['workload']['edges']
         self.system = self.data['system_config']
-        self.schedule = {}  # stores {node_id: (processor, start, end)}
-        self.proc_ready_time = {}  # tracks when each processor is ready
+        self._procs_cfg = self.system['processors']
+        
+        node_idx = {nid: i for i, nid in enumerate(self.nodes)}
+        self._init_graph(
+            list(self.nodes), tuple(self._procs_cfg.keys()),
+            [node_idx[e['from']] for e in self.edges],
+            [node_idx[e['to']] for e in self.edges],
+            [e['data_size_MB'] for e in self.edges],
+            self.system['bandwidth_MBps'], self.system['latency_ms'])
+        
+        # Precompute computation cost table: comp_cost[node_idx, proc_idx] in ms
+        self.comp_cost = self.build_cost_table()
+        self.avg_comp_cost = self.comp_cost.mean(axis=1)
+    
+    def _init_graph(self, node_ids, procs, src, dst, data_mb, bandwidth, latency):
+        """Set up index maps, edge arrays and empty schedule shared by all constructors"""
+        self._bw = bandwidth
+        self._lat = latency
+        self._links_built = False  # successor CSR arrays built lazily
+        self._pred_list = None  # predecessor lists, only built for get_earliest_start_time
+        self._rank = None  # upward ranks, computed on first use
+        self._kernels = _kernels(len(node_ids))
+        
+        # Integer indices for nodes and processors (used by the cost tables)
+        self.node_ids = list(node_ids)
+        self.node_idx = {nid: i for i, nid in enumerate(self.node_ids)}
+        self.procs = tuple(procs)
+        self.num_procs = len(self.procs)
+        self.proc_idx = {p: i for i, p in enumerate(self.procs)}
+        self.proc_ready_time = np.zeros(self.num_procs)  # when each processor is ready
+        
+        # Schedule as parallel arrays indexed by node (processor index -1 = unscheduled),
+        # plus the order in which tasks were scheduled
+        self._sched_proc_idx = np.full(len(self.node_ids), -1, np.int64)
+        self._sched_start = np.zeros(len(self.node_ids))
+        self._sched_end = np.zeros(len(self.node_ids))
+        self._sched_order = np.empty(0, np.int64)
+        
+        # Communication cost is data_size * _bw_inv_ms + _lat
+        self._bw_inv_ms = 1000.0 / self._bw
+        
+        # Edges as parallel arrays with the transfer time of every edge; bandwidth and
+        # latency are shared by all processor pairs, so this is also the average
+        self._edge_src = np.asarray(src, np.int32)
+        self._edge_dst = np.asarray(dst, np.int32)
+        data_mb = np.asarray(data_mb, dtype=float)
+        self._edge_cost_ms = data_mb * self._bw_inv_ms + self._lat
         
+        # Lookups by (from, to) node id for the per-edge public helpers
+        edge_keys = [(self.node_ids[s], self.node_ids[d])
+                     for s, d in zip(self._edge_src.tolist(), self._edge_dst.tolist())]
+        self.edge_data = dict(zip(edge_keys, data_mb.tolist()))
+        self._comm_ms_per_edge = dict(zip(edge_keys, self._edge_cost_ms.tolist()))
+    
+    @property
+    def schedule(self):
+        """Scheduled tasks as {node_id: (processor, start, end)}, in scheduling order"""
+        procs = self._sched_proc_idx.tolist()
+        starts = self._sched_start.tolist()
+        ends = self._sched_end.tolist()
+        return {
+            self.node_ids[i]: (self.procs[procs[i]], starts[i], ends[i])
+            for i in self._sched_order.tolist()
+        }
+    
     def get_comm_cost(self, parent_id, child_id, target_proc):
         """Calculate communication cost between parent and child nodes"""
         # If both are on same chip, cost is 0
-        parent_proc, _, _ = self.schedule.get(parent_id, (None, 0, 0))
-        if parent_proc == target_proc or parent_proc is None:
+        parent_proc = self._sched_proc_idx[self.node_idx[parent_id]]
+        if parent_proc < 0 or self.procs[parent_proc] == target_proc:
             return 0
         
         # Calculate data transfer overhead
-        data_size = next(e['data_size_MB'] for e in self.edges 
-                        if e['from'] == parent_id and e['to'] == child_id)
-        return (data_size / self.system['bandwidth_MBps'] * 1000) + self.system['latency_ms']
+        try:
+            return self._comm_ms_per_edge[(parent_id, child_id)]
+        except KeyError:
+            raise KeyError(f"No edge from {parent_id!r} to {child_id!r}") from None
     
-    def get_computation_cost(self, node_id, processor):
-        """Get computation time for a node on a specific processor"""
-        node = self.nodes[node_id]
+    def build_cost_table(self):
+        """Build the (nodes x processors) computation cost table in ms"""
+        comp_cost = np.empty((len(self.node_ids), self.num_procs))
         
-        # If node has costs dictionary, use it directly (already in ms)
-        if 'costs' in node and isinstance(node['costs'], dict):
-            return node['costs'].get(processor, 0)
+        # Nodes with a costs dictionary use it directly (already in ms)
+        derived = []
+        for i, node_id in enumerate(self.node_ids):
+            node = self.nodes[node_id]
+            if 'costs' in node and isinstance(node['costs'], dict):
+                comp_cost[i] = [node['costs'].get(proc, 0) for proc in self.procs]
+            else:
+                derived.append(i)
         
         # Otherwise, calculate based on workload intensity and processor performance
-        proc_config = self.system['processors'][processor]
-        base_time = node['workload_intensity_GFLOPS'] / proc_config['performance_GFLOPS']
-        return base_time * 1000  # Convert to ms
+        if derived:
+            intensity = np.array([self.nodes[self.node_ids[i]]['workload_intensity_GFLOPS']
+                                  for i in derived], dtype=float)
+            perf = np.array([self._procs_cfg[p]['performance_GFLOPS']
+                             for p in self.procs], dtype=float)
+            comp_cost[derived] = (intensity[:, None] / perf[None, :]) * 1000.0  # Convert to ms
+        
+        return comp_cost
     
-    def build_dependency_graph(self):
-        """Build adjacency lists for dependencies"""
-        predecessors = defaultdict(list)
-        successors = defaultdict(list)
+    def get_computation_cost(self, node_id, processor):
+        """Get computation time for a node on a specific processor"""
+        return self.comp_cost[self.node_idx[node_id], self.proc_idx[processor]]
+    
+    def _links(self):
+        """Build successor links (by node index) once and cache them"""
+        if self._links_built:
+            return
+        
+        num_nodes = len(self.node_ids)
+        src, dst = self._edge_src, self._edge_dst
         
-        for edge in self.edges:
-            predecessors[edge['to']].append(edge['from'])
-            successors[edge['from']].append(edge['to'])
+        # Integer CSR form of the successor lists, in edge order
+        self._succ_ptr = np.zeros(num_nodes + 1, np.int32)
+        np.cumsum(np.bincount(src, minlength=num_nodes), out=self._succ_ptr[1:])
+        edge_order = np.argsort(src, kind='stable')
+        self._succ_idx = dst[edge_order]
+        self._succ_cost = self._edge_cost_ms[edge_order]
+        self._in_degree = np.bincount(dst, minlength=num_nodes).astype(np.int32)
         
-        return predecessors, successors
+        self._links_built = True
+    
+    def _pred_csr(self):
+        """Predecessor lists as CSR arrays (in edge order) with per-edge transfer cost (ms)"""
+        self._links()
+        
+        num_nodes = len(self.node_ids)
+        pred_ptr = np.zeros(num_nodes + 1, np.int64)
+        np.cumsum(np.bincount(self._edge_dst, minlength=num_nodes), out=pred_ptr[1:])
+        edge_order = np.argsort(self._edge_dst, kind='stable')
+        return pred_ptr, self._edge_src[edge_order].astype(np.int64), self._edge_cost_ms[edge_order]
     
     def topological_sort(self):
-        """Perform topological sort to get task ordering"""
-        predecessors, successors = self.build_dependency_graph()
+        """Perform topological sort to get task ordering (as node indices)"""
+        self._links()
+        return self._kernels.kahn_order(self._succ_ptr, self._succ_idx, self._in_degree)
+    
+    def _compute_ranks(self, topo_order):
+        """Calculate upward ranks for all nodes (used for prioritization)"""
+        # Bucket nodes by their distance to an exit node
+        level = self._kernels.sink_levels(topo_order, self._succ_ptr, self._succ_idx)
+        level_order = np.argsort(level, kind='stable')
+        level_ptr = np.zeros(level.max(initial=-1) + 2, np.int64)
+        np.cumsum(np.bincount(level), out=level_ptr[1:])
         
-        # Calculate in-degree
-        in_degree = {node_id: len(predecessors[node_id]) for node_id in self.nodes}
+        rank = self._kernels.upward_ranks(self.avg_comp_cost, self._succ_ptr, self._succ_idx,
+                             self._succ_cost, level_ptr, level_order)
+        return rank
+    
+    def get_earliest_start_time(self, node_id, processor):
+        """Calculate earliest start time for a node on a processor
         
-        # Find all entry nodes (no predecessors)
-        queue = deque([node_id for node_id, degree in in_degree.items() if degree == 0])
-        topo_order = []
+        Public helper for inspecting a schedule; optimize() does not call it.
+        Predecessors that are not scheduled yet are skipped.
+        """
+        # Predecessor lists are only needed here, so build them on first use
+        if self._pred_list is None:
+            self._pred_list = [[] for _ in self.node_ids]
+            for s, d in zip(self._edge_src.tolist(), self._edge_dst.tolist()):
+                self._pred_list[d].append(s)
         
-        while queue:
-            node_id = queue.popleft()
-            topo_order.append(node_id)
-            
-            for succ in successors[node_id]:
-                in_degree[succ] -= 1
-                if in_degree[succ] == 0:
-                    queue.append(succ)
-        
-        return topo_order, predecessors, successors
-    
-    def calculate_rank(self, node_id, successors, rank_cache):
-        """Calculate upward rank for a node (used for prioritization)"""
-        if node_id in rank_cache:
-            return rank_cache[node_id]
-        
-        # Average computation cost across all processors
-        avg_comp_cost = sum(self.get_computation_cost(node_id, proc) 
-                           for proc in self.system['processors']) / len(self.system['processors'])
-        
-        if not successors[node_id]:
-            # Exit node
-            rank_cache[node_id] = avg_comp_cost
-            return avg_comp_cost
-        
-        # Recursively calculate rank considering successors
-        max_succ_rank = 0
-        for succ in successors[node_id]:
-            # Average communication cost
-            avg_comm_cost = sum(self.get_comm_cost(node_id, succ, proc) 
-                               for proc in self.system['processors']) / len(self.system['processors'])
-            succ_rank = self.calculate_rank(succ, successors, rank_cache)
-            max_succ_rank = max(max_succ_rank, avg_comm_cost + succ_rank)
-        
-        rank_cache[node_id] = avg_comp_cost + max_succ_rank
-        return rank_cache[node_id]
-    
-    def get_earliest_start_time(self, node_id, processor, predecessors):
-        """Calculate earliest start time for a node on a processor"""
         # When the processor is ready
-        proc_ready = self.proc_ready_time.get(processor, 0)
+        proc_ready = self.proc_ready_time[self.proc_idx[processor]]
         
         # When all data dependencies are satisfied
         data_ready = 0
-        for pred_id in predecessors[node_id]:
-            if pred_id in self.schedule:
-                pred_proc, pred_start, pred_end = self.schedule[pred_id]
+        for pred in self._pred_list[self.node_idx[node_id]]:
+            if self._sched_proc_idx[pred] >= 0:
+                pred_id = self.node_ids[pred]
                 comm_cost = self.get_comm_cost(pred_id, node_id, processor)
-                data_ready = max(data_ready, pred_end + comm_cost)
+                data_ready = max(data_ready, self._sched_end[pred] + comm_cost)
         
         return max(proc_ready, data_ready)
     
+    def upward_ranks(self):
+        """Upward rank of every node, indexed like node_ids (computed once)"""
+        if self._rank is None:
+            topo_order = self.topological_sort()
+            
+            # Nodes left out of the topological order sit on a cycle and can never be ranked
+            if len(topo_order) < len(self.node_ids):
+                raise ValueError("Workload graph contains a cycle; HEFT requires a DAG")
+            
+            self._rank = self._compute_ranks(topo_order)
+        return self._rank
+    
     def optimize(self):
         """Main HEFT algorithm implementation"""
         # Phase 1: Task Prioritization (Ranking)
-        topo_order, predecessors, successors = self.topological_sort()
-        rank_cache = {}
-        
-        # Calculate ranks for all nodes
-        for node_id in self.nodes:
-            self.calculate_rank(node_id, successors, rank_cache)
+        rank = self.upward_ranks()
         
         # Sort tasks by rank in decreasing order (higher rank = higher priority)
-        sorted_tasks = sorted(self.nodes.keys(), key=lambda x: rank_cache[x], reverse=True)
-        
-        # Initialize processor ready times
-        for proc in self.system['processors']:
-            self.proc_ready_time[proc] = 0
+        task_order = np.argsort(-rank, kind='stable')
         
         # Phase 2: Processor Selection
-        for node_id in sorted_tasks:
-            best_proc = None
-            best_eft = float('inf')  # Earliest Finish Time
-            best_est = 0  # Earliest Start Time
-            
-            # Try scheduling on each processor
-            for proc in self.system['processors']:
-                est = self.get_earliest_start_time(node_id, proc, predecessors)
-                comp_cost = self.get_computation_cost(node_id, proc)
-                eft = est + comp_cost
-                
-                # Select processor with minimum EFT
-                if eft < best_eft:
-                    best_eft = eft
-                    best_est = est
-                    best_proc = proc
-            
-            # Schedule the task on the best processor
-            self.schedule[node_id] = (best_proc, best_est, best_eft)
-            self.proc_ready_time[best_proc] = best_eft
+        pred_ptr, pred_idx, edge_cost_ms = self._pred_csr()
+        self._sched_proc_idx, self._sched_start, self._sched_end = self._kernels.heft_schedule(
+            self.comp_cost, pred_ptr, pred_idx, edge_cost_ms, task_order)
+        self._sched_order = task_order
+        
+        # Each processor is ready once its last task finishes
+        self.proc_ready_time = np.zeros(self.num_procs)
+        np.maximum.at(self.proc_ready_time, self._sched_proc_idx, self._sched_end)
         
         return self.get_results()
     
     def get_results(self):
         """Format and return the scheduling results"""
         # Calculate makespan (maximum finish time)
-        makespan = max(end for _, _, end in self.schedule.values())
+        makespan = float(self._sched_end.max())
         
-        # Create mapping dictionary
-        mapping = {node_id: proc for node_id, (proc, _, _) in self.schedule.items()}
-        
-        # Create detailed schedule
-        detailed_schedule = {
-            node_id: {
+        # Create mapping dictionary and detailed schedule in scheduling order
+        mapping = {}
+        detailed_schedule = {}
+        procs = self._sched_proc_idx.tolist()
+        starts = self._sched_start.tolist()
+        ends = self._sched_end.tolist()
+        for i in self._sched_order.tolist():
+            node_id, proc = self.node_ids[i], self.procs[procs[i]]
+            mapping[node_id] = proc
+            detailed_schedule[node_id] = {
                 'processor': proc,
-                'start_time_ms': start,
-                'end_time_ms': end,
-                'duration_ms': end - start
+                'start_time_ms': starts[i],
+                'end_time_ms': ends[i],
+                'duration_ms': ends[i] - starts[i]
             }
-            for node_id, (proc, start, end) in self.schedule.items()
-        }
         
         return {
             'mapping': mapping,
@@ -205,7 +467,7 @@ if __name__ == "__main__":
         }
     }
     
-    scheduler = CADOScheduler(json.dumps(config))
+    scheduler = CADOScheduler.from_dict(config)
     results = scheduler.optimize()
     
     print("=" * 60)
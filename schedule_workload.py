@@ -258,7 +258,7 @@ For workload JSON format, see YOLOV8_USAGE_GUIDE.md
         print("RUNNING HEFT SCHEDULER...")
         print("="*80)
     
-    scheduler = CADOScheduler(json.dumps(config))
+    scheduler = CADOScheduler.from_dict(config)
     results = scheduler.optimize()
     
     # Print results
@@ -1,9 +1,47 @@
-import json
+import contextlib
+import io
 import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 sys.path.append('/home/claude')
 from cado_scheduler import CADOScheduler
 
-def test_heterogeneous_system():
+# Task assignment row templates, formatted with a node id and its detailed schedule
+TASK_ROW = ("  {node_id}: {processor:6s} [{start_time_ms:7.2f} - {end_time_ms:7.2f}] "
+            "(compute: {duration_ms:6.2f} ms)\n")
+TASK_ROW_WIDE = ("  {node_id:10s}: {processor:6s} [{start_time_ms:7.2f} - {end_time_ms:7.2f}] "
+                 "(compute: {duration_ms:6.2f} ms)\n")
+
+def precomputed_scheduler(config):
+    """Scheduler factory that takes its upward ranks from a separate scheduler"""
+    return CADOScheduler.from_precomputed(config, CADOScheduler(config).upward_ranks())
+
+def config_to_arrays(config):
+    """Convert a list-of-dicts config into the SoA arrays taken by CADOScheduler.from_arrays"""
+    workload, system = config['workload'], config['system_config']
+    node_ids = [node['id'] for node in workload['nodes']]
+    node_idx = {node_id: i for i, node_id in enumerate(node_ids)}
+    procs = list(system['processors'])
+    
+    intensity = np.array([node['workload_intensity_GFLOPS'] for node in workload['nodes']], dtype=float)
+    perf = np.array([system['processors'][proc]['performance_GFLOPS'] for proc in procs], dtype=float)
+    
+    return {
+        'node_ids': node_ids,
+        'procs': procs,
+        'comp_cost': intensity[:, None] / perf[None, :] * 1000.0,
+        'src': np.array([node_idx[edge['from']] for edge in workload['edges']], dtype=np.int32),
+        'dst': np.array([node_idx[edge['to']] for edge in workload['edges']], dtype=np.int32),
+        'data_mb': np.array([edge['data_size_MB'] for edge in workload['edges']], dtype=float),
+        'bandwidth_MBps': system['bandwidth_MBps'],
+        'latency_ms': system['latency_ms']
+    }
+
+def array_scheduler(config):
+    """Scheduler factory that ingests the config as arrays"""
+    return CADOScheduler.from_arrays(**config_to_arrays(config))
+
+def test_heterogeneous_system(scheduler_factory=CADOScheduler):
     """Test with a more realistic heterogeneous workload"""
     config = {
         "workload": {
@@ -39,44 +77,50 @@ def test_heterogeneous_system():
         }
     }
     
-    print("\n" + "="*70)
-    print("TEST 1: Heterogeneous System with Complex DAG")
-    print("="*70)
-    print("\nSystem Configuration:")
-    print("  Processors: CPU (50 GFLOPS), GPU (400 GFLOPS), TPU (200 GFLOPS), FPGA (100 GFLOPS)")
-    print("  Bandwidth: 800 MB/s")
-    print("  Latency: 2 ms")
-    print("\nWorkload: 7 tasks with varying computational intensity")
+    # Output is collected and written in one go at the end
+    out = []
+    out.append("\n" + "="*70 + "\n")
+    out.append("TEST 1: Heterogeneous System with Complex DAG\n")
+    out.append("="*70 + "\n")
+    out.append("\nSystem Configuration:\n")
+    out.append("  Processors: CPU (50 GFLOPS), GPU (400 GFLOPS), TPU (200 GFLOPS), FPGA (100 GFLOPS)\n")
+    out.append("  Bandwidth: 800 MB/s\n")
+    out.append("  Latency: 2 ms\n")
+    out.append("\nWorkload: 7 tasks with varying computational intensity\n")
     
-    scheduler = CADOScheduler(json.dumps(config))
+    scheduler = scheduler_factory(config)
     results = scheduler.optimize()
     
-    print(f"\n{'RESULTS':^70}")
-    print("-"*70)
-    print(f"Total Makespan: {results['makespan_ms']:.2f} ms")
-    
-    print("\nTask Assignment:")
-    for node_id in sorted(results['mapping'].keys()):
-        proc = results['mapping'][node_id]
-        sched = results['detailed_schedule'][node_id]
-        print(f"  {node_id}: {proc:6s} [{sched['start_time_ms']:7.2f} - {sched['end_time_ms']:7.2f}] "
-              f"(compute: {sched['duration_ms']:6.2f} ms)")
-    
-    # Calculate processor utilization
-    proc_work_time = {}
-    for node_id, (proc, start, end) in scheduler.schedule.items():
-        if proc not in proc_work_time:
-            proc_work_time[proc] = 0
-        proc_work_time[proc] += (end - start)
-    
-    print("\nProcessor Utilization:")
-    for proc in sorted(proc_work_time.keys()):
-        util = (proc_work_time[proc] / results['makespan_ms']) * 100
-        print(f"  {proc}: {proc_work_time[proc]:.2f} ms ({util:.1f}%)")
+    out.append(f"\n{'RESULTS':^70}\n")
+    out.append("-"*70 + "\n")
+    out.append(f"Total Makespan: {results['makespan_ms']:.2f} ms\n")
+    
+    # Report tasks in node id order, sorted once
+    node_order = tuple(sorted(results['mapping']))
+    out.append("\nTask Assignment:\n")
+    for node_id in node_order:
+        out.append(TASK_ROW.format(node_id=node_id, **results['detailed_schedule'][node_id]))
+    
+    # Calculate processor utilization (scatter-add of task durations per processor)
+    proc_to_idx = {name: i for i, name in enumerate(config['system_config']['processors'])}
+    schedule = list(scheduler.schedule.values())
+    proc_of_task = np.fromiter((proc_to_idx[proc] for proc, _, _ in schedule), dtype=np.intp)
+    durations = np.fromiter((end - start for _, start, end in schedule), dtype=np.float64)
+    proc_work_time = np.zeros(len(proc_to_idx))
+    np.add.at(proc_work_time, proc_of_task, durations)
+    used = np.bincount(proc_of_task, minlength=len(proc_to_idx)) > 0
     
+    out.append("\nProcessor Utilization:\n")
+    for proc, i in sorted(proc_to_idx.items()):
+        if not used[i]:
+            continue
+        util = (proc_work_time[i] / results['makespan_ms']) * 100
+        out.append(f"  {proc}: {proc_work_time[i]:.2f} ms ({util:.1f}%)\n")
+    
+    sys.stdout.write("".join(out))
     return results
 
-def test_data_intensive_workload():
+def test_data_intensive_workload(scheduler_factory=CADOScheduler):
     """Test with high data transfer costs"""
     config = {
         "workload": {
@@ -103,38 +147,164 @@ def test_data_intensive_workload():
         }
     }
     
-    print("\n" + "="*70)
-    print("TEST 2: Data-Intensive Workload (High Communication Cost)")
-    print("="*70)
-    print("\nSystem Configuration:")
-    print("  Processors: CPU (100 GFLOPS), GPU (500 GFLOPS)")
-    print("  Bandwidth: 100 MB/s (LOW)")
-    print("  Latency: 10 ms (HIGH)")
-    print("\nWorkload: Pipeline with large data transfers (500 MB each)")
+    # Output is collected and written in one go at the end
+    out = []
+    out.append("\n" + "="*70 + "\n")
+    out.append("TEST 2: Data-Intensive Workload (High Communication Cost)\n")
+    out.append("="*70 + "\n")
+    out.append("\nSystem Configuration:\n")
+    out.append("  Processors: CPU (100 GFLOPS), GPU (500 GFLOPS)\n")
+    out.append("  Bandwidth: 100 MB/s (LOW)\n")
+    out.append("  Latency: 10 ms (HIGH)\n")
+    out.append("\nWorkload: Pipeline with large data transfers (500 MB each)\n")
     
-    scheduler = CADOScheduler(json.dumps(config))
+    scheduler = scheduler_factory(config)
     results = scheduler.optimize()
     
-    print(f"\n{'RESULTS':^70}")
-    print("-"*70)
-    print(f"Total Makespan: {results['makespan_ms']:.2f} ms")
+    out.append(f"\n{'RESULTS':^70}\n")
+    out.append("-"*70 + "\n")
+    out.append(f"Total Makespan: {results['makespan_ms']:.2f} ms\n")
     
-    print("\nTask Assignment:")
-    for node_id in ['Load', 'Process1', 'Process2', 'Merge']:
-        proc = results['mapping'][node_id]
-        sched = results['detailed_schedule'][node_id]
-        print(f"  {node_id:10s}: {proc:6s} [{sched['start_time_ms']:7.2f} - {sched['end_time_ms']:7.2f}] "
-              f"(compute: {sched['duration_ms']:6.2f} ms)")
+    # Report tasks in node id order, sorted once
+    node_order = tuple(sorted(results['mapping']))
+    out.append("\nTask Assignment:\n")
+    for node_id in node_order:
+        out.append(TASK_ROW_WIDE.format(node_id=node_id, **results['detailed_schedule'][node_id]))
     
     # Note: The algorithm should prefer keeping tasks on the same processor
     # to minimize communication overhead
     processors_used = set(results['mapping'].values())
-    print(f"\nProcessors used: {len(processors_used)} ({', '.join(sorted(processors_used))})")
+    out.append(f"\nProcessors used: {len(processors_used)} ({', '.join(sorted(processors_used))})\n")
     if len(processors_used) == 1:
-        print("  → All tasks on same processor to avoid high communication cost!")
+        out.append("  → All tasks on same processor to avoid high communication cost!\n")
     
+    sys.stdout.write("".join(out))
     return results
 
+def test_array_ingest():
+    """Array-ingested schedulers must match the dict config path exactly"""
+    assert test_heterogeneous_system(array_scheduler) == test_heterogeneous_system()
+    assert test_data_intensive_workload(array_scheduler) == test_data_intensive_workload()
+
+def test_array_ingest_rejects_bad_input():
+    """from_arrays must refuse arrays that don't describe a consistent graph"""
+    good = dict(node_ids=['A', 'B'], procs=['P', 'Q'], comp_cost=np.ones((2, 2)),
+                src=[0], dst=[1], data_mb=[1.0], bandwidth_MBps=1000, latency_ms=1)
+    CADOScheduler.from_arrays(**good).optimize()
+    
+    bad_inputs = [
+        {'comp_cost': np.ones((5, 2))},           # more cost rows than nodes
+        {'comp_cost': np.ones((1, 2))},           # fewer cost rows than nodes
+        {'comp_cost': np.ones((2, 3))},           # wrong processor count
+        {'src': [0, 1]},                          # edge arrays of different lengths
+        {'data_mb': []},
+        {'dst': [2]},                             # node index past the end
+        {'src': [-1]},                            # negative node index
+    ]
+    for bad in bad_inputs:
+        try:
+            CADOScheduler.from_arrays(**{**good, **bad})
+        except ValueError:
+            continue
+        raise AssertionError(f"from_arrays accepted {bad}")
+
+def test_precomputed_ranks():
+    """Schedulers built from precomputed ranks must match the plain constructor"""
+    assert test_heterogeneous_system(precomputed_scheduler) == test_heterogeneous_system()
+    assert test_data_intensive_workload(precomputed_scheduler) == test_data_intensive_workload()
+
+def test_precomputed_rejects_bad_rank():
+    """from_precomputed must refuse a rank array that doesn't match the node count"""
+    config = {
+        "workload": {
+            "nodes": [{"id": "A", "workload_intensity_GFLOPS": 10},
+                      {"id": "B", "workload_intensity_GFLOPS": 10}],
+            "edges": [{"from": "A", "to": "B", "data_size_MB": 1}]
+        },
+        "system_config": {
+            "processors": {"CPU": {"performance_GFLOPS": 10}, "GPU": {"performance_GFLOPS": 50}},
+            "bandwidth_MBps": 1000,
+            "latency_ms": 1
+        }
+    }
+    for rank in ([1.0], np.ones(8), np.ones((2, 1))):
+        try:
+            CADOScheduler.from_precomputed(config, rank)
+        except ValueError:
+            continue
+        raise AssertionError(f"from_precomputed accepted a rank of shape {np.shape(rank)}")
+
+def test_jit_kernels_match_python():
+    """The numba-compiled kernels must schedule exactly like the plain Python ones"""
+    try:
+        import numba  # noqa: F401
+    except ImportError:  # numba is optional; nothing to compare against
+        return
+    import cado_scheduler
+    
+    plain = test_heterogeneous_system()
+    saved = cado_scheduler._JIT_MIN_NODES, cado_scheduler._jit_kernels, cado_scheduler.prange
+    try:
+        # Force the JIT path for a small graph
+        cado_scheduler._JIT_MIN_NODES = 1
+        cado_scheduler._jit_kernels = None
+        def jit_scheduler(config):
+            scheduler = CADOScheduler(config)
+            assert scheduler._kernels is not cado_scheduler._PY_KERNELS
+            return scheduler
+        assert test_heterogeneous_system(jit_scheduler) == plain
+    finally:
+        cado_scheduler._JIT_MIN_NODES, cado_scheduler._jit_kernels, cado_scheduler.prange = saved
+
+def test_upward_ranks():
+    """rank(exit) = avg comp; rank(A) = avg comp(A) + avg comm(A->B) + rank(B)"""
+    config = {
+        "workload": {
+            "nodes": [{"id": "A", "workload_intensity_GFLOPS": 10},
+                      {"id": "B", "workload_intensity_GFLOPS": 20}],
+            "edges": [{"from": "A", "to": "B", "data_size_MB": 5}]
+        },
+        "system_config": {
+            "processors": {"CPU": {"performance_GFLOPS": 10}, "GPU": {"performance_GFLOPS": 50}},
+            "bandwidth_MBps": 1000,
+            "latency_ms": 1
+        }
+    }
+    avg_a = (10 / 10 * 1000 + 10 / 50 * 1000) / 2
+    avg_b = (20 / 10 * 1000 + 20 / 50 * 1000) / 2
+    comm = 5 / 1000 * 1000 + 1
+    
+    rank = CADOScheduler(config).upward_ranks()
+    assert np.allclose(rank, [avg_a + comm + avg_b, avg_b])
+
+def test_cycle_rejected():
+    """optimize() must refuse a workload graph that isn't a DAG"""
+    config = {
+        "workload": {
+            "nodes": [{"id": "A", "workload_intensity_GFLOPS": 10},
+                      {"id": "B", "workload_intensity_GFLOPS": 10}],
+            "edges": [{"from": "A", "to": "B", "data_size_MB": 1},
+                      {"from": "B", "to": "A", "data_size_MB": 1}]
+        },
+        "system_config": {
+            "processors": {"CPU": {"performance_GFLOPS": 10}},
+            "bandwidth_MBps": 1000,
+            "latency_ms": 1
+        }
+    }
+    try:
+        CADOScheduler(config).optimize()
+    except ValueError:
+        return
+    raise AssertionError("optimize() accepted a cyclic workload")
+
+def run_captured(test, *args):
+    """Run a test function, returning (results, captured stdout)"""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        results = test(*args)
+    return results, buf.getvalue()
+
 if __name__ == "__main__":
     # Run comprehensive tests
     print("\n" + "#"*70)
@@ -142,8 +312,13 @@ if __name__ == "__main__":
     print("#" + " "*20 + "(HEFT Algorithm Implementation)" + " "*19 + "#")
     print("#"*70)
     
-    results1 = test_heterogeneous_system()
-    results2 = test_data_intensive_workload()
+    # The two tests are independent: run them in parallel and print their
+    # captured output in a fixed order once both are done
+    with ProcessPoolExecutor(max_workers=2) as ex:
+        f1 = ex.submit(run_captured, test_heterogeneous_system)
+        f2 = ex.submit(run_captured, test_data_intensive_workload)
+        (results1, output1), (results2, output2) = f1.result(), f2.result()
+    sys.stdout.write(output1 + output2)
     
     print("\n" + "="*70)
     print("SUMMARY")